@@ -3,17 +3,45 @@ import sys
 import curses
 import curses.ascii
 import json
-import math
+import mmap
 import re
+import threading
 import traceback
+from functools import lru_cache
+from itertools import accumulate
 from typing import Dict, Tuple, List, Any
 import argparse
+import bisect
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from enum import Enum
 
+try:
+    import orjson  # 可选依赖，安装后解析和格式化JSON更快
+except ImportError:
+    orjson = None
+
 
 # curses.KEY_BACKSPACE = 8
 SEARCH_HIGHLIGHT = 6
 KEY_HIGHLIGHT = 3
+JSON_KEY_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*":')  # 允许键中出现转义字符，如 "a\"b":
+LONG_INT_PATTERN = re.compile(r'\d{19}')  # 19位及以上的整数可能超出64位范围（含负数），orjson 会把它们解析成浮点数
+MAX_DUMP_CHARS = 1 << 20  # 单条数据格式化输出的最大字符数
+PREFETCH_OFFSETS = (1, -1, 2, -2)  # 空闲时预先格式化的相邻数据，按优先级排列
+# 只显示值时，由这些字符组成的搜索词若出现在格式化文本中，也必然出现在原始数据里（除非经过转义）
+RAW_SEARCH_PATTERN = re.compile(r'(?:[A-Za-z_]|[^\x00-\x7f])+')
+# 格式化文本中可能出现、但原始数据中不一定有的内容，搜索词是其子串时不做原始数据预筛
+RAW_SEARCH_EXCLUDED = ("Error: Invalid JSON data.", "Error: Empty file.", "Truncated: data entry is too large to display in full.",
+                       "Infinity", "NaN", "null", "e")
+ESCAPED_NEWLINE_PATTERN = re.compile(r'(?<!\\)\\n')  # 字符串中的 \n 转义，显示时换成真正的换行
+ESCAPED_NEWLINE_BYTES = re.compile(rb'(?<!\\)\\n')
+PAD_LINES = 200  # 数据模式预先着色绘制的行数，在此范围内滚动无需重新绘制
+SEARCH_CHECK_INTERVAL = 64  # 搜索时每格式化多少条数据检查一次是否取消
+TYPE_MARK = '\x00'  # 仅显示结构时包裹类型名的标记，序列化后为 ESCAPED_TYPE_MARK
+ESCAPED_TYPE_MARK = '\\u0000'
+TYPE_MARKED_NAMES = {t: TYPE_MARK + t.__name__ + TYPE_MARK for t in (str, int, float, bool, type(None))}  # JSON中各类值对应的结构显示文本
+COLOR_ATTRS = {}  # {颜色对编号: curses 属性}，由 init_colors 填充
 
 parser = argparse.ArgumentParser()
 parser.add_argument('-d', '--debug', action='store_true', help='Enable debug mode')
@@ -40,104 +68,207 @@ class Logger:
 log = Logger()
 
 
-class TypeDisplayJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        # 对于类型对象，返回一个特殊的字典结构
-        if isinstance(obj, type):
-            return {"__class__": obj.__name__}
-        elif hasattr(obj, '__dict__'):
-            return obj.__dict__
-        return super().default(obj)
-    
-    def encode(self, obj):
-        # 先调用父类的 encode 生成标准 JSON
-        json_str = super().encode(obj)
-        
-        # 使用正则表达式替换特殊标记
-        # 将 {"__class__": "str"} 替换为 str
-        json_str = re.sub(r'\{[\s\n]*"__class__"\s*:\s*"(\w+)"[\s\n]*\}', r'\1', json_str)
-        return json_str
-
-
 class JSONDataCache:
-    """JSON数据缓存，避免重复序列化"""
+    """JSON数据缓存，避免重复序列化；在打开的各个文件之间共享，按条数和估计的内存占用淘汰"""
     
-    def __init__(self, max_size=100):
+    def __init__(self, max_size=200, max_chars=64 << 20):
         self.max_size = max_size
-        self.full_cache: Dict[int, List[str]] = {}  # {data_index: lines}
-        self.skeleton_cache: Dict[int, List[str]] = {}  # {data_index: lines}
-        self.access_order: List[int] = []  # 访问顺序，用于LRU
+        self.max_chars = max_chars  # 缓存文本的总字符数上限，用于估计并限制内存占用
+        self.total_chars = 0
+        # OrderedDict 按访问顺序排列，命中时移到末尾、淘汰时弹出开头，均为O(1)
+        # 键中的 source 为 (文件路径, 修改时间, 文件大小)，区分不同文件，文件修改后旧数据不再命中
+        # 完整内容和仅结构两种显示方式分别缓存，仅结构的内容只在切换显示方式后才生成
+        self.lines_cache: OrderedDict[tuple, Tuple[List[Tuple[str, int]], int]] = OrderedDict()  # {(source, data_index, cols, show_values): (lines, chars)}
+        # 格式化后的文本与宽度无关，单独缓存，窗口大小变化时只需重新切分
+        self.str_cache: OrderedDict[tuple, Tuple[str, int]] = OrderedDict()  # {(source, data_index, show_values): (json_str, chars)}
+        # 搜索用的拼接文本，同一条数据内反复搜索下一处时无需重新拼接
+        self.search_cache: OrderedDict[tuple, Tuple[Tuple[List[Tuple[str, int]], str, List[int]], int]] = OrderedDict()  # {(source, data_index, cols, show_values): ((lines, joined, line_starts), chars)}
+        # 着色用的拼接文本和JSON键位置，滚动到新的位置重新绘制时无需再次匹配JSON键
+        self.layout_cache: OrderedDict[tuple, Tuple[Tuple[List[Tuple[str, int]], str, List[Tuple[int, int]], List[Tuple[int, int]]], int]] = OrderedDict()  # {(source, data_index, cols, show_values): ((lines, string, line_spans, key_spans), chars)}
+        # 后台预取线程也会读写缓存，OrderedDict 的操作需要加锁；格式化本身在锁外进行
+        self.lock = threading.Lock()
+    
+    def _get(self, cache, cache_key):
+        """查找缓存，命中时更新访问顺序，调用时需持有锁"""
+        if cache_key in cache:
+            cache.move_to_end(cache_key)
+            return cache[cache_key][0]
+        return None
+    
+    def _put(self, cache, cache_key, value, chars):
+        """写入缓存，超过条数或总字符数上限时移除该缓存中最久未使用的数据，调用时需持有锁"""
+        if cache_key in cache:
+            self.total_chars -= cache[cache_key][1]
+        cache[cache_key] = (value, chars)
+        cache.move_to_end(cache_key)
+        self.total_chars += chars
+        # 至少保留刚写入的数据，单条数据超过上限时也能显示
+        while len(cache) > self.max_size or (self.total_chars > self.max_chars and len(cache) > 1):
+            _, (_, old_chars) = cache.popitem(last=False)
+            self.total_chars -= old_chars
     
-    def get_lines(self, data_index: int, cols: int, json_line: str) -> Tuple[List[str], List[str]]:
+    def get_lines(self, source, data_index: int, cols: int, json_line: str, show_values: bool = True) -> List[Tuple[str, int]]:
         """获取缓存的行，如果没有则打印并缓存"""
-        cache_key = data_index
-        
-        # 更新访问顺序
-        if cache_key in self.access_order:
-            self.access_order.remove(cache_key)
-        self.access_order.append(cache_key)
-        
-        # 如果缓存超过最大大小，移除最久未使用的
-        while len(self.access_order) > self.max_size:
-            old_key = self.access_order.pop(0)
-            self.full_cache.pop(old_key, None)
-            self.skeleton_cache.pop(old_key, None)
+        # 按终端宽度区分缓存，窗口大小变化后重新换行
+        cache_key = (source, data_index, cols, show_values)
         
-        # 如果缓存中存在，直接返回
-        if cache_key in self.full_cache and cache_key in self.skeleton_cache:
-            return self.full_cache[cache_key], self.skeleton_cache[cache_key]
+        # 如果缓存中存在，更新访问顺序后直接返回
+        with self.lock:
+            lines = self._get(self.lines_cache, cache_key)
+        if lines is not None:
+            return lines
         
         # 否则打印并缓存
-        full_lines_with_lineno, skeleton_lines_with_lineno = dump_json_data(json_line, cols)
+        lines = split_json_lines(self.get_str(source, data_index, json_line, show_values), cols)
+        with self.lock:
+            self._put(self.lines_cache, cache_key, lines, sum(len(l) for l, _ in lines))
+        return lines
+    
+    def get_str(self, source, data_index: int, json_line: str, show_values: bool = True) -> str:
+        """获取缓存的格式化文本，如果没有则格式化并缓存"""
+        cache_key = (source, data_index, show_values)
+        with self.lock:
+            json_str = self._get(self.str_cache, cache_key)
+        if json_str is not None:
+            return json_str
         
-        self.full_cache[cache_key] = full_lines_with_lineno
-        self.skeleton_cache[cache_key] = skeleton_lines_with_lineno
+        json_str = format_json_data(json_line, show_values)
+        with self.lock:
+            self._put(self.str_cache, cache_key, json_str, len(json_str))
+        return json_str
+    
+    def get_search_text(self, source, data_index: int, cols: int, show_values: bool, lines_with_lineno: List[Tuple[str, int]]) -> Tuple[str, List[int]]:
+        """获取显示行拼接后的文本和各行起始位置，如果没有则拼接并缓存"""
+        cache_key = (source, data_index, cols, show_values)
+        with self.lock:
+            cached = self._get(self.search_cache, cache_key)
+        # 只有缓存对应的正是这些显示行时才命中，显示行重新生成后自动失效
+        if cached is not None and cached[0] is lines_with_lineno:
+            return cached[1:]
         
-        return full_lines_with_lineno, skeleton_lines_with_lineno
+        joined, line_starts = join_lines(lines_with_lineno)
+        with self.lock:
+            self._put(self.search_cache, cache_key, (lines_with_lineno, joined, line_starts), len(joined))
+        return joined, line_starts
     
-    def clear(self):
-        """清空缓存"""
-        self.full_cache.clear()
-        self.skeleton_cache.clear()
-        self.access_order.clear()
+    def get_layout(self, source, data_index: int, cols: int, show_values: bool, lines_with_lineno: List[Tuple[str, int]]) -> Tuple[str, List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """获取着色用的拼接文本、各显示行区间和JSON键区间，如果没有则计算并缓存"""
+        cache_key = (source, data_index, cols, show_values)
+        with self.lock:
+            cached = self._get(self.layout_cache, cache_key)
+        # 与搜索文本相同，只有缓存对应的正是这些显示行时才命中
+        if cached is not None and cached[0] is lines_with_lineno:
+            return cached[1:]
+        
+        layout = layout_json_lines(lines_with_lineno)
+        with self.lock:
+            self._put(self.layout_cache, cache_key, (lines_with_lineno,) + layout, len(layout[0]))
+        return layout
+    
+    def clear(self, source=None):
+        """清空缓存，指定 source 时只清除该文件的数据"""
+        caches = (self.lines_cache, self.str_cache, self.search_cache, self.layout_cache)
+        with self.lock:
+            for cache in caches:
+                if source is None:
+                    cache.clear()
+                    continue
+                for cache_key in [cache_key for cache_key in cache if cache_key[0] == source]:
+                    del cache[cache_key]
+            self.total_chars = sum(chars for cache in caches for _, chars in cache.values())
     
     def get_cache_info(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
-        return {
-            "cache_size": len(self.full_cache),
-            "max_size": self.max_size,
-            "memory_usage_estimate": sum(len(''.join(lines)) for lines in self.full_cache.values()) // 1024  # KB
-        }
+        with self.lock:
+            return {
+                "cache_size": len(self.lines_cache),
+                "max_size": self.max_size,
+                "memory_usage_estimate": self.total_chars // 1024  # KB
+            }
+
+
+class FileDataCache:
+    """共享的 JSONDataCache 中单个文件的数据，按数据编号访问"""
+    
+    def __init__(self, json_cache, source):
+        self.json_cache = json_cache
+        self.source = source
+    
+    def get_lines(self, data_index, cols, json_line, show_values=True):
+        return self.json_cache.get_lines(self.source, data_index, cols, json_line, show_values)
+    
+    def get_search_text(self, data_index, cols, show_values, lines_with_lineno):
+        return self.json_cache.get_search_text(self.source, data_index, cols, show_values, lines_with_lineno)
+    
+    def get_layout(self, data_index, cols, show_values, lines_with_lineno):
+        return self.json_cache.get_layout(self.source, data_index, cols, show_values, lines_with_lineno)
+    
+    def clear(self):
+        self.json_cache.clear(self.source)
+
+
+def get_file_source(path):
+    """返回区分缓存数据来源的 (文件路径, 修改时间, 文件大小)，文件修改后缓存自动失效"""
+    try:
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return path, None, None
 
 
 class FileCache:
-    def __init__(self):
-        self.cache = {}  # {path: (timestamp, [file_list])}
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        # 与 JSONDataCache 相同，按访问顺序淘汰最久未访问的目录，浏览大量目录时内存不会无限增长
+        self.cache: OrderedDict[str, Tuple[int, List[str], Dict[str, int]]] = OrderedDict()  # {path: (mtime_ns, [file_list], {file_name: index})}
     
     def get_files(self, path):
-        current_time = os.path.getmtime(path)
-        
-        if path in self.cache:
-            cached_time, files = self.cache[path]
-            if cached_time == current_time:
-                return files
-        
-        # 重新读取文件列表
         try:
-            paths = os.listdir(path)
-            paths.sort()
+            # 使用纳秒精度的整数修改时间，避免浮点时间戳漏掉同一时刻内的变化
+            current_time = os.stat(path).st_mtime_ns
+            
+            if path in self.cache:
+                cached_time, files, _ = self.cache[path]
+                if cached_time == current_time:
+                    self.cache.move_to_end(path)
+                    return files
             
-            # 分离文件和文件夹
-            folders = [f + '/' for f in paths if os.path.isdir(os.path.join(path, f))]
-            files = [f for f in paths if os.path.isfile(os.path.join(path, f))]
+            # 重新读取文件列表：单次 scandir 遍历分离文件和文件夹，目录项自带类型信息，无需逐个 stat
+            folders, files = [], []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            folders.append(entry.name + '/')
+                        elif entry.is_file():
+                            files.append(entry.name)
+                    except OSError:
+                        # 单个条目无法访问（如失效的挂载点）时跳过，不影响整个目录
+                        pass
+            folders.sort()
+            files.sort()
             result = ['../'] + folders + files
             
             # 更新缓存
-            self.cache[path] = (current_time, result)
+            self.cache[path] = (current_time, result, {name: index for index, name in enumerate(result)})
+            self.cache.move_to_end(path)
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
             return result
         except (OSError, PermissionError):
             return ['../']
     
+    def filter(self, path, files, search_str):
+        """按搜索词筛选 files（忽略大小写），与高亮使用同一个正则，列出的文件名必定有高亮位置"""
+        search = compile_search_pattern(search_str, True).search
+        return [name for name in files if search(name)]
+
+    def get_name_index(self, path, files):
+        """返回 files 中文件名到下标的映射，查找选中位置时无需线性扫描"""
+        if path in self.cache and self.cache[path][1] is files:
+            return self.cache[path][2]
+        return {name: index for index, name in enumerate(files)}
+
     def clear(self):
         self.cache.clear()
 
@@ -160,16 +291,111 @@ class ToolSelector:
         self.tool = tool
 
 
+class KeyAction(Enum):
+    HELP = 0
+    REFRESH = 1
+    CLEAR_CACHE = 2
+    UP = 3
+    DOWN = 4
+    LEFT = 5
+    RIGHT = 6
+    PAGE_UP = 7
+    PAGE_DOWN = 8
+    ENTER = 9
+    BACKSPACE = 10
+    TAB = 11
+    BACK_TAB = 12
+    ESC = 13
+
+# 按键码到动作的映射，每次按键只需一次字典查找（450~457、506 为部分终端的小键盘键码）
+KEY_ACTIONS = {
+    curses.KEY_IC: KeyAction.HELP, 506: KeyAction.HELP,  # INSERT
+    ord('a') & 0x1f: KeyAction.REFRESH,  # Ctrl+A
+    ord('z') & 0x1f: KeyAction.CLEAR_CACHE, 2: KeyAction.CLEAR_CACHE,  # Ctrl+Z / Ctrl+B
+    curses.KEY_UP: KeyAction.UP, 450: KeyAction.UP,
+    curses.KEY_DOWN: KeyAction.DOWN, 456: KeyAction.DOWN,
+    curses.KEY_LEFT: KeyAction.LEFT, 452: KeyAction.LEFT,
+    curses.KEY_RIGHT: KeyAction.RIGHT, 454: KeyAction.RIGHT,
+    curses.KEY_PPAGE: KeyAction.PAGE_UP, 451: KeyAction.PAGE_UP,
+    curses.KEY_NPAGE: KeyAction.PAGE_DOWN, 457: KeyAction.PAGE_DOWN,
+    ord('\n'): KeyAction.ENTER,
+    curses.KEY_BACKSPACE: KeyAction.BACKSPACE, 127: KeyAction.BACKSPACE,
+    9: KeyAction.TAB,
+    curses.KEY_BTAB: KeyAction.BACK_TAB,
+    27: KeyAction.ESC,
+}
+
+
+class JsonlFile:
+    """按需读取的jsonl文件，只记录每行的起始位置，避免把整个文件读入内存"""
+    
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.offsets = [0]  # 每行的起始字节位置，最后一项为文件末尾
+        # 空文件无法映射
+        if os.fstat(self.file.fileno()).st_size:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            # 逐行读取映射内存并累加各行长度得到起始位置，整个循环在C层完成，不逐行执行 Python 代码
+            self.offsets = list(accumulate(map(len, iter(self.data.readline, b'')), initial=0))
+        else:
+            self.data = b''
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError("JsonlFile index out of range")
+        # 直接从映射内存切片，不再 seek + read 发起系统调用
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+    
+    def find_candidate(self, needle, start_index):
+        """从 start_index 开始查找原始字节可能包含 needle 的第一条数据，没有时返回数据条数"""
+        # 格式化时 \n 转义会被换成换行、\u 转义会被解码，含有这两种转义的数据需要进一步检查
+        targets = (needle, b'\\u', b'\\n')
+        next_pos = [0] * len(targets)  # 各目标下一次出现的位置，避免每条数据都从头扫描
+        index = start_index
+        while index < len(self):
+            start = self.offsets[index]
+            for i, target in enumerate(targets):
+                if next_pos[i] != -1 and next_pos[i] < start:
+                    next_pos[i] = self.data.find(target, start)
+            found = [pos for pos in next_pos if pos != -1]
+            if not found:
+                break
+            index = bisect.bisect_right(self.offsets, min(found)) - 1
+            raw = self.data[self.offsets[index]:self.offsets[index + 1]]
+            if needle in raw or b'\\u' in raw or needle in ESCAPED_NEWLINE_BYTES.sub(b'', raw):
+                return index
+            index += 1
+        return len(self)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+
 def read_jsonl(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        json_lines = f.readlines()
-    return json_lines
+    try:
+        return JsonlFile(path)
+    except Exception as e:
+        return [str(e)]
 
 
 def read_json(path):
     try:
         with open(path, 'r', encoding='utf-8') as f:
-            json_data = json.load(f)
+            content = f.read()
+        # 优先使用orjson解析和序列化；超过64位的整数、NaN 等orjson不支持的内容交给标准库处理
+        if orjson is not None and not LONG_INT_PATTERN.search(content):
+            try:
+                json_data = orjson.loads(content)
+                items = json_data if isinstance(json_data, list) else [json_data]
+                return [orjson.dumps(d).decode('utf-8') for d in items]
+            except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+                pass
+        json_data = json.loads(content)
         if isinstance(json_data, list):
             json_lines = [json.dumps(d) for d in json_data]
         else:
@@ -188,172 +414,324 @@ def read_txt(path):
         return [str(e)]
 
 
+def init_colors():
+    """初始化颜色，并缓存各颜色对的属性值，绘制时无需反复调用 curses.color_pair"""
+    curses.start_color()
+    curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)  # 白色
+    curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)    # 红色
+    curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)  # 绿色
+    curses.init_pair(4, curses.COLOR_BLUE, curses.COLOR_BLACK)   # 蓝色
+    curses.init_pair(5, curses.COLOR_YELLOW, curses.COLOR_BLACK) # 黄色
+    curses.init_pair(6, curses.COLOR_BLACK, curses.COLOR_YELLOW) # 警告
+    for pair in range(1, 7):
+        COLOR_ATTRS[pair] = curses.color_pair(pair)
+
+
+def str_width(s):
+    """字符串显示宽度，英文字符宽度为1，其余字符宽度为2"""
+    # 忽略非ASCII字符编码后长度之差即为非ASCII字符数，计数在C层完成，无需逐字符调用 ord
+    return 2 * len(s) - len(s.encode('ascii', 'ignore'))
+
+
 def split_str(s, n):
+    n = max(int(n), 1)
+    # 纯ASCII字符串每个字符宽度都是1，直接按固定长度切片，无需逐字符计算
+    if s.isascii():
+        return [s[i:i + n] for i in range(0, len(s), n)] or ['']
     result = []
-    length = 0
-    n = int(n)
-    current_str = ''
-    for char in s:
-        char_length = 1 if ord(char) < 128 else 2  # 英文字符长度为1，中文字符长度为2
-        if length + char_length <= n:
-            current_str += char
-            length += char_length
-        else:
-            result.append(current_str)
-            current_str = char
-            length = char_length
-    result.append(current_str)
-    return result
-
-
-def add_colored_json(stdscr, row, col, lines_with_lineno, search=None):
-    def mark_sub_str(pattern, string, string_mark, color):
-        # 查找所有匹配的子串
-        for match in re.finditer(pattern, string):
-            for i in range(match.start(), match.end()):
-                string_mark[i] = color
-        return string_mark
-    
-    string = ""
+    start = 0
+    while True:
+        end = min(start + n, len(s))  # 每个字符宽度至少为1，一段最多容纳 n 个字符
+        excess = str_width(s[start:end]) - n
+        if excess <= 0 and end == len(s):
+            result.append(s[start:])
+            return result
+        # 超出宽度时按超出量的一半回退（每个字符宽度不超过2），直到放得下为止
+        while excess > 0:
+            end -= (excess + 1) // 2
+            excess = str_width(s[start:end]) - n
+        # 回退时最多多退出一列，若下一个字符是英文字符则补回
+        if excess < 0 and s[end].isascii():
+            end += 1
+        end = max(end, start + 1)  # 宽度容纳不下一个中文字符时，每段仍至少包含一个字符
+        result.append(s[start:end])
+        start = end
+
+
+@lru_cache(maxsize=8)
+def compile_search_pattern(search_str, ignore_case=False):
+    """编译按字面匹配的搜索正则，同一搜索词只编译一次"""
+    return re.compile(re.escape(search_str), re.IGNORECASE if ignore_case else 0)
+
+
+def layout_json_lines(lines_with_lineno):
+    """拼接显示行用于着色，不同原始行之间以换行分隔，返回 (拼接后的文本, 各显示行区间, JSON键区间)"""
+    parts = []
+    line_spans = []  # 每个显示行在拼接字符串中的区间
+    pos = 0
     cur_lineno = lines_with_lineno[0][1] if lines_with_lineno else 0
     for l, i in lines_with_lineno:
         if cur_lineno != i and i != 0:
-            string += '\n'
+            parts.append('\n')
+            pos += 1
             cur_lineno = i
-        string += l
-
-    # 记录每个字符的颜色标记
-    string_mark = [1 for _ in string]
-    # 标记JSON键颜色
-    string_mark = mark_sub_str(r'\"[^\\\"]*?\":', string, string_mark, KEY_HIGHLIGHT)
-    # 标记搜索字颜色
+        parts.append(l)
+        line_spans.append((pos, pos + len(l)))
+        pos += len(l)
+    string = ''.join(parts)
+    key_spans = [match.span() for match in JSON_KEY_PATTERN.finditer(string)]
+    return string, line_spans, key_spans
+
+
+def add_colored_json(stdscr, row, col, layout, first=0, last=None, search=None):
+    """着色绘制 layout 中第 first 到 last 个显示行，layout 由 layout_json_lines 生成"""
+    string, line_spans, key_spans = layout
+    line_spans = line_spans[first:last]
+    if not line_spans:
+        return
+    window_start, window_end = line_spans[0][0], line_spans[-1][1]
+
+    # 取出与绘制范围重叠的JSON键区间（各区间互不重叠且有序），查找范围内搜索字所在的区间，搜索字颜色优先
+    key_spans = key_spans[max(bisect.bisect_left(key_spans, (window_start,)) - 1, 0):bisect.bisect_left(key_spans, (window_end,))]
+    search_spans = []
     if search:
-        string_mark = mark_sub_str(re.escape(search), string, string_mark, SEARCH_HIGHLIGHT)
-
-    # 根据颜色标记分段显示
-    mark = 1
-    item_list = []
-    string_cache = ""
-    for s, m in zip(string, string_mark):
-        if m != mark:
-            item_list.append((string_cache, mark))
-            string_cache = s
-            mark = m
+        # 搜索字是字面量，直接用 str.find 逐个查找，不经过正则引擎
+        start = string.find(search, window_start, window_end)
+        while start >= 0:
+            search_spans.append((start, start + len(search)))
+            start = string.find(search, start + len(search), window_end)
+
+    # 以范围内所有区间端点切分字符串，逐段确定颜色并合并相邻同色段
+    bounds = sorted(bound for bound in {window_start, window_end}.union(*key_spans, *search_spans) if window_start <= bound <= window_end)
+    item_list = []  # [(start, end, color)]
+    key_idx, search_idx = 0, 0
+    for start, end in zip(bounds, bounds[1:]):
+        while key_idx < len(key_spans) and key_spans[key_idx][1] <= start:
+            key_idx += 1
+        while search_idx < len(search_spans) and search_spans[search_idx][1] <= start:
+            search_idx += 1
+        if search_idx < len(search_spans) and search_spans[search_idx][0] <= start:
+            mark = SEARCH_HIGHLIGHT
+        elif key_idx < len(key_spans) and key_spans[key_idx][0] <= start:
+            mark = KEY_HIGHLIGHT
         else:
-            string_cache += s
-    if string_cache:
-        item_list.append((string_cache, mark))
-
-    for i, item in enumerate(item_list):
-        if i == 0:
-            stdscr.addstr(row, col, item[0], curses.color_pair(item[1]))
+            mark = 1
+        if item_list and item_list[-1][2] == mark:
+            item_list[-1] = (item_list[-1][0], end, mark)
         else:
-            stdscr.addstr(item[0], curses.color_pair(item[1]))
-
-
-def load_json_data(json_lines, selected_data, cols, json_cache=None):
-    """使用缓存加载JSON数据"""
+            item_list.append((start, end, mark))
+
+    # 每个显示行单独定位输出，不依赖终端自动换行，显示行与屏幕行一一对应
+    item_idx = 0
+    for offset, (line_start, line_end) in enumerate(line_spans):
+        stdscr.move(row + offset, col)
+        while item_idx < len(item_list) and item_list[item_idx][1] <= line_start:
+            item_idx += 1
+        i = item_idx
+        while i < len(item_list) and item_list[i][0] < line_end:
+            start, end, mark = item_list[i]
+            stdscr.addstr(string[max(start, line_start):min(end, line_end)], COLOR_ATTRS[mark])
+            i += 1
+
+
+def load_json_data(json_lines, selected_data, cols, json_cache=None, show_values=True):
+    """使用缓存加载JSON数据，show_values 为 False 时只加载结构"""
     if json_cache is None:
         # 如果没有缓存，回退到原始方法
-        return dump_json_data(json_lines[selected_data], cols)
+        return dump_json_data(json_lines[selected_data], cols, show_values)
     
     try:
         json_line = json_lines[selected_data]
-        full_lines_with_lineno, skeleton_lines_with_lineno = json_cache.get_lines(selected_data, cols, json_line)
-        return full_lines_with_lineno, skeleton_lines_with_lineno
+        return json_cache.get_lines(selected_data, cols, json_line, show_values)
     except IndexError:
-        return ["Error: Empty file."], ["Error: Empty file."]
+        return [("Error: Empty file.", 0)]
     except Exception as e:
-        return [f"Error: {str(e)}"], [f"Error: {str(e)}"]
+        return [(f"Error: {str(e)}"[:cols], 0)]
 
 
-def dump_json_data(json_line, cols):
-    """打印数据"""
-    try:
-        full_json_data = json.loads(json_line)
-        full_json_str = json.dumps(full_json_data, ensure_ascii=False, indent=2)
-        full_json_str = re.sub(r'(?<!\\)\\n', '\n', full_json_str)
-
-        def replace_non_dict_with_none(data):
-            """
-            递归地将字典中所有非字典的值替换为None
-            """
-            if isinstance(data, dict):
-                for key in data:
-                    if isinstance(data[key], dict) or isinstance(data[key], list):
-                        replace_non_dict_with_none(data[key])
-                    else:
-                        data[key] = type(data[key])
-            elif isinstance(data, list):
-                for i, _ in enumerate(data):
-                    if isinstance(data[i], dict) or isinstance(data[i], list):
-                        replace_non_dict_with_none(data[i])
-                    else:
-                        data[i] = type(data[i])
-            return data
+def dump_json_truncated(json_data, max_chars=MAX_DUMP_CHARS):
+    """流式格式化JSON，输出超过max_chars后停止，避免为超大数据生成完整字符串"""
+    chunks = []
+    length = 0
+    for chunk in json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(json_data):
+        chunks.append(chunk)
+        length += len(chunk)
+        if length >= max_chars:
+            chunks.append("\n... (Truncated: data entry is too large to display in full.)")
+            break
+    return ''.join(chunks)
+
+
+def loads_json(json_line):
+    """只解析JSON不格式化，优先使用orjson"""
+    if orjson is not None and not LONG_INT_PATTERN.search(json_line):
+        try:
+            return orjson.loads(json_line)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(json_line)
 
-        skeleton_json_data = replace_non_dict_with_none(full_json_data.copy())
-        skeleton_json_str = json.dumps(skeleton_json_data, cls=TypeDisplayJSONEncoder, ensure_ascii=False, indent=2)
-        skeleton_json_str = re.sub(r'(?<!\\)\\n', '\n', skeleton_json_str)
+
+def parse_json(json_line):
+    """解析并格式化JSON，优先使用orjson"""
+    # orjson 会把超过64位的整数解析成浮点数，这类数据交给标准库处理
+    if orjson is not None and not LONG_INT_PATTERN.search(json_line):
+        try:
+            json_data = orjson.loads(json_line)
+            if len(json_line) > MAX_DUMP_CHARS:
+                return json_data, dump_json_truncated(json_data)
+            return json_data, orjson.dumps(json_data, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+            pass  # orjson 不支持 NaN 等写法，交给标准库处理
+    json_data = json.loads(json_line)
+    if len(json_line) > MAX_DUMP_CHARS:
+        return json_data, dump_json_truncated(json_data)
+    return json_data, json.dumps(json_data, ensure_ascii=False, indent=2)
+
+
+def build_skeleton(data):
+    """递归生成只保留结构的数据，字典和列表以外的值替换为以标记包裹的类型名，不修改原数据"""
+    if isinstance(data, dict):
+        return {key: build_skeleton(value) if isinstance(value, (dict, list)) else TYPE_MARKED_NAMES[type(value)] for key, value in data.items()}
+    if isinstance(data, list):
+        return [build_skeleton(value) if isinstance(value, (dict, list)) else TYPE_MARKED_NAMES[type(value)] for value in data]
+    return TYPE_MARKED_NAMES[type(data)]
+
+
+def format_json_data(json_line, show_values=True):
+    """格式化数据，show_values 为 True 时返回完整文本，否则返回仅结构的文本，与终端宽度无关"""
+    try:
+        if show_values:
+            _, full_json_str = parse_json(json_line)
+            return ESCAPED_NEWLINE_PATTERN.sub('\n', full_json_str)
+
+        skeleton_json_data = build_skeleton(loads_json(json_line))
+        # 类型名以标记包裹的字符串写入，序列化后去掉引号和标记即可，无需自定义编码器和正则
+        if orjson is not None:
+            skeleton_json_str = orjson.dumps(skeleton_json_data, option=orjson.OPT_INDENT_2).decode('utf-8')
+        else:
+            skeleton_json_str = json.dumps(skeleton_json_data, ensure_ascii=False, indent=2)
+        skeleton_json_str = skeleton_json_str.replace('"' + ESCAPED_TYPE_MARK, '').replace(ESCAPED_TYPE_MARK + '"', '')
+        return ESCAPED_NEWLINE_PATTERN.sub('\n', skeleton_json_str)
     except json.JSONDecodeError:
-        full_json_str = "Error: Invalid JSON data."
-        skeleton_json_str = "Error: Invalid JSON data."
+        return "Error: Invalid JSON data."
     except IndexError:
-        full_json_str = "Error: Empty file."
-        skeleton_json_str = "Error: Empty file."
+        return "Error: Empty file."
 
-    full_lines_with_lineno, skeleton_lines_with_lineno = [], []
-    for i, line in enumerate(full_json_str.split('\n')):
-        full_lines_with_lineno.extend([(l, i) for l in split_str(line, cols)])
-    for i, line in enumerate(skeleton_json_str.split('\n')):
-        skeleton_lines_with_lineno.extend([(l, i) for l in split_str(line, cols)])
-    return full_lines_with_lineno, skeleton_lines_with_lineno
 
+def split_json_lines(json_str, cols):
+    """按终端宽度切分格式化后的文本，返回 [(显示行, 原始行号)]"""
+    lines_with_lineno = []
+    for i, line in enumerate(json_str.split('\n')):
+        lines_with_lineno.extend([(l, i) for l in split_str(line, cols)])
+    return lines_with_lineno
 
-def search_in_list(string_list, target_string):
-    if not target_string:
-        return 0
-    
-    # 遍历列表，查找可能的起始位置
-    for i in range(len(string_list)):
-        # 构建从当前位置开始的连续字符串
-        built_str = string_list[i]
-        
-        # 向后拼接，直到长度足够或到列表末尾
-        for j in range(i + 1, len(string_list)):
-            built_str += string_list[j]
 
-            # 检查当前拼接的字符串中是否包含目标字符串
-            if target_string in built_str and target_string not in string_list[j]:
-                return i + 1  # 返回起始位置（从1开始计数）
-            elif len(built_str) >= len(target_string):
-                break  # 长度已足够但仍未匹配，跳出内层循环
-    
-    return -1
+def dump_json_data(json_line, cols, show_values=True):
+    """打印数据"""
+    return split_json_lines(format_json_data(json_line, show_values), cols)
+
+
+def join_lines(lines_with_lineno):
+    """把显示行拼接成一个字符串，返回 (拼接后的文本, 各行起始位置)，最后一项为文本长度"""
+    joined = ''.join(l for l, _ in lines_with_lineno)
+    line_starts = list(accumulate((len(l) for l, _ in lines_with_lineno), initial=0))
+    return joined, line_starts
 
 
-def search_next(json_lines, selected_data, start_line, search_str, show_values, cols):
+def search_in_text(joined, line_starts, target_string, start_line):
+    """从第 start_line 行开头开始查找，返回匹配开始所在的行号，没有匹配时返回-1"""
+    # 在拼接后的整段文本中只做一次查找，可以匹配跨越换行的内容
+    pos = joined.find(target_string, line_starts[min(start_line, len(line_starts) - 1)])
+    if pos == -1:
+        return -1
+    # 根据各行的起始位置，找到匹配开始所在的行
+    return bisect.bisect_right(line_starts, pos) - 1
+
+
+def get_raw_search_needle(json_lines, search_str, show_values):
+    """返回可用于在原始字节中预筛数据的搜索词，不能预筛时返回None"""
+    if not isinstance(json_lines, JsonlFile) or not show_values or not RAW_SEARCH_PATTERN.fullmatch(search_str):
+        return None
+    if any(search_str in text for text in RAW_SEARCH_EXCLUDED):
+        return None
+    return search_str.encode('utf-8')
+
+
+def is_key_pressed(stdscr, key):
+    """不阻塞地检查输入队列中是否有指定按键，其他按键按原顺序放回队列"""
+    pending = []
+    stdscr.nodelay(True)
+    try:
+        while True:
+            next_key = stdscr.getch()
+            if next_key == -1:
+                break
+            pending.append(next_key)
+    finally:
+        stdscr.nodelay(False)
+    found = key in pending
+    # ungetch 是后进先出，逆序放回才能保持原来的读取顺序
+    for next_key in reversed(pending):
+        if next_key != key:
+            curses.ungetch(next_key)
+    return found
+
+
+def search_next(json_lines, selected_data, start_line, search_str, show_values, cols, json_cache=None, stdscr=None):
+    if not search_str:
+        return selected_data, start_line
+    raw_needle = get_raw_search_needle(json_lines, search_str, show_values)
+    origin = (selected_data, start_line)
+    checked = 0
     while selected_data < len(json_lines):
-        full_lines_with_lineno, skeleton_lines_with_lineno = load_json_data(json_lines, selected_data, cols)
-        lines_with_lineno = full_lines_with_lineno if show_values else skeleton_lines_with_lineno
-        line_diff = search_in_list([l for l, _ in lines_with_lineno[start_line+1:]], search_str)
-        if line_diff != -1:
-            next_line = start_line + line_diff
+        # 在大文件中搜索可能耗时较长，定期检查是否按下ESC取消搜索
+        checked += 1
+        if stdscr is not None and checked % SEARCH_CHECK_INTERVAL == 0 and is_key_pressed(stdscr, 27):
+            return origin
+        # 复用显示用的缓存：当前数据无需重新格式化，找到的数据跳转后也能直接显示
+        lines_with_lineno = load_json_data(json_lines, selected_data, cols, json_cache, show_values)
+        if json_cache is not None:
+            joined, line_starts = json_cache.get_search_text(selected_data, cols, show_values, lines_with_lineno)
+        else:
+            joined, line_starts = join_lines(lines_with_lineno)
+        next_line = search_in_text(joined, line_starts, search_str, start_line + 1)
+        if next_line != -1:
             return selected_data, next_line
 
         selected_data += 1
         start_line = -1
+        # 跳过原始数据中不可能包含搜索词的数据，不必逐条格式化
+        if raw_needle is not None:
+            selected_data = json_lines.find_candidate(raw_needle, selected_data)
     return 0, 0
 
 
 def get_key_lines(lines):
     key_lines_list = []
     for i, line in enumerate(lines):
-        if re.search(r'\"[^\\\"]*?\":', line):
+        if JSON_KEY_PATTERN.search(line):
             key_lines_list.append(i)
     return key_lines_list
 
 
+def count_repeated_key(stdscr, key):
+    """读取输入队列中紧跟着的相同按键，返回连续按下的次数，按住方向键时只需重绘一次"""
+    count = 1
+    stdscr.nodelay(True)
+    try:
+        next_key = stdscr.getch()
+        while next_key == key:
+            count += 1
+            next_key = stdscr.getch()
+        # 不同的按键放回队列，留给下一次处理
+        if next_key != -1:
+            curses.ungetch(next_key)
+    finally:
+        stdscr.nodelay(False)
+    return count
+
+
 def display_help_info(stdscr):
     help_lines = [
         "File Explorer Help",
@@ -393,6 +771,7 @@ def display_help_info(stdscr):
         "      Type any text        : Search for the text in current data file",
         "      BACKSPACE            : Delete last character in search",
         "      ENTER                : Jump to next occurrence",
+        "      ESC (while LOADING)  : Cancel the running search",
         "    Jump Tool",
         "      Type line number     : Choose specified data entry (1-based)",
         "      BACKSPACE            : Delete last character in line number",
@@ -402,47 +781,102 @@ def display_help_info(stdscr):
     ]
     
     start_line = 0
+    lines_cols = None  # 已切分的帮助文本对应的宽度，宽度不变时无需重新切分
 
     while True:
-        stdscr.clear()
+        stdscr.erase()
         rows, cols = stdscr.getmaxyx()
-        lines = []
-        for line in help_lines:
-            lines.extend(split_str(line, cols))
+        if lines_cols != cols:
+            lines = []
+            for line in help_lines:
+                lines.extend(split_str(line, cols))
+            lines_cols = cols
         for i, line in enumerate(lines[start_line:start_line+rows-1]):
             stdscr.addstr(i, 0, line[:cols-1], curses.A_BOLD)
-        stdscr.refresh()
+        stdscr.noutrefresh()
+        curses.doupdate()
 
-        key = stdscr.getch()
-        if key == 27:  # ESC key
-            stdscr.clear()
+        action = KEY_ACTIONS.get(stdscr.getch())
+        if action is KeyAction.ESC:
+            stdscr.erase()
             return
-        elif key == curses.KEY_UP or key == 450:
+        elif action is KeyAction.UP:
             start_line = max(0, start_line - 1)
-        elif key == curses.KEY_DOWN or key == 456:
+        elif action is KeyAction.DOWN:
             start_line = min(len(lines) - rows + 1, start_line + 1)
 
 
+@lru_cache(maxsize=1024)  # 移动光标和翻页时同一文件名会以相同搜索词反复重绘
+def find_match_spans(path, search_str):
+    """返回文件名中忽略大小写匹配搜索词的所有区间"""
+    return tuple(match.span() for match in compile_search_pattern(search_str, True).finditer(path))
+
+
+def display_file_row(stdscr, row, path, selected, search_str, cols):
+    """显示文件列表中的一行"""
+    mode_select = curses.A_REVERSE if selected else curses.A_NORMAL
+    
+    # 按显示宽度截断到窗口宽度，中文等宽字符不会溢出到下一行
+    visible = split_str(path, cols)[0]
+    # 找到所有匹配的位置，只保留显示范围内的部分
+    match_spans = [(start_pos, min(end_pos, len(visible))) for start_pos, end_pos in
+                   (find_match_spans(path, search_str) if search_str else ()) if start_pos < len(visible)]
+    
+    if not match_spans or visible.isascii():
+        # 整行一次输出；纯ASCII文件名的字符下标就是列号，匹配部分直接用 chgat 改为高亮属性
+        stdscr.addstr(row, 0, visible, mode_select)
+        for start_pos, end_pos in match_spans:
+            stdscr.chgat(row, start_pos, end_pos - start_pos, COLOR_ATTRS[SEARCH_HIGHLIGHT])
+        return
+    
+    # 含非ASCII字符时各字符宽度不一，按匹配位置切分成 (文本, 属性) 段，由终端决定各段所在的列
+    segments = []
+    last_pos = 0
+    for start_pos, end_pos in match_spans:
+        if last_pos < start_pos:
+            segments.append((visible[last_pos:start_pos], mode_select))
+        segments.append((visible[start_pos:end_pos], COLOR_ATTRS[SEARCH_HIGHLIGHT]))
+        last_pos = end_pos
+    if last_pos < len(visible):
+        segments.append((visible[last_pos:], mode_select))
+    
+    # 从行首开始依次在光标处输出各段
+    stdscr.move(row, 0)
+    for text, attr in segments:
+        stdscr.addstr(text, attr)
+
+
+def get_page_count(item_count, row_per_page):
+    """计算总页数（整数向上取整），空列表算作一页"""
+    return (item_count + row_per_page - 1) // row_per_page if item_count else 1
+
+
+def get_page_info(paths, original_files, selected_file, search_str, row_per_page):
+    """生成页面信息"""
+    page = selected_file // row_per_page if paths else 0
+    page_info = f"Page: {page + 1} / {get_page_count(len(paths), row_per_page)}, Pos: {selected_file + 1}"
+    if search_str:
+        page_info += f", Found {len(paths)} / {len(original_files)} items"
+    return page_info
+
+
 def display_files(stdscr, current_path, selected_file, search_str="", file_cache=None, original_files=None, key=""):
-    stdscr.clear()
+    stdscr.erase()
     rows, cols = stdscr.getmaxyx()
     
     # 使用缓存获取文件列表
     if original_files is None:
         original_files = file_cache.get_files(current_path) if file_cache else []
     
-    paths = original_files.copy()
+    # 文件列表只读不改，无搜索时直接使用原列表，不再复制
+    paths = original_files
     
     # 如果有搜索词，筛选路径
     if search_str:
-        filtered_paths = []
-        for path in paths:
-            if search_str.lower() in path.lower():
-                filtered_paths.append(path)
-        paths = filtered_paths
+        file_cache = file_cache or FileCache()
+        paths = file_cache.filter(current_path, original_files, search_str)
         # 如果筛选后没有文件，保持选中位置为0
         if not paths:
-            paths = []
             selected_file = 0
 
     # 显示所有路径
@@ -451,71 +885,78 @@ def display_files(stdscr, current_path, selected_file, search_str="", file_cache
     paths_in_page = paths[page * row_per_page : min((page + 1) * row_per_page, len(paths))]
     
     for idx, path in enumerate(paths_in_page):
-        display_path = path[:cols]
-        mode_select = curses.A_REVERSE if idx == selected_file % row_per_page else curses.A_NORMAL
-        mode_folder = curses.A_UNDERLINE if path.endswith('/') else curses.A_NORMAL
-        
-        # 如果有搜索词，高亮匹配的部分
-        if search_str and search_str.lower() in path.lower():
-            # 找到所有匹配的位置
-            start_positions = []
-            lower_path = path.lower()
-            lower_search = search_str.lower()
-            pos = lower_path.find(lower_search)
-            while pos != -1:
-                start_positions.append(pos)
-                pos = lower_path.find(lower_search, pos + 1)
-            
-            # 分段显示并高亮
-            current_col = 0
-            last_pos = 0
-            for start_pos in start_positions:
-                end_pos = start_pos + len(search_str)
-                # 显示非高亮部分
-                if last_pos < start_pos:
-                    normal_part = path[last_pos:start_pos]
-                    if current_col + len(normal_part) < cols:
-                        stdscr.addstr(idx + 2, current_col, normal_part, mode_select)
-                        current_col += len(normal_part)
-                
-                # 显示高亮部分
-                highlight_part = path[start_pos:end_pos]
-                if current_col + len(highlight_part) < cols:
-                    stdscr.addstr(idx + 2, current_col, highlight_part, curses.color_pair(SEARCH_HIGHLIGHT))
-                    current_col += len(highlight_part)
-                
-                last_pos = end_pos
-            
-            # 显示剩余部分
-            if last_pos < len(path):
-                remaining_part = path[last_pos:]
-                if current_col + len(remaining_part) < cols:
-                    stdscr.addstr(idx + 2, current_col, remaining_part, mode_select)
-        else:
-            # 没有搜索词时的正常显示
-            stdscr.addstr(idx + 2, 0, display_path, mode_select)
+        display_file_row(stdscr, idx + 2, path, idx == selected_file % row_per_page, search_str, cols)
 
     # 显示页面信息和提示
     stdscr.addstr(0, 0, f"Current directory: {current_path}\n"[:cols], curses.A_BOLD)
-    page_info = f"Page: {page + 1} / {math.ceil(len(paths) / row_per_page) if paths else 1}, Pos: {selected_file + 1}"
-    if search_str:
-        page_info += f", Found {len(paths)} / {len(original_files)} items"
+    page_info = get_page_info(paths, original_files, selected_file, search_str, row_per_page)
     stdscr.addstr(1, 0, page_info[:cols], curses.A_BOLD)
     stdscr.addstr(rows - 2, 0, f"[...] Search: {search_str}"[:cols], curses.A_BOLD)
-    stdscr.addstr(rows - 1, 0, "[...] Press INSERT for help information."[:cols], curses.A_BOLD)
+    stdscr.addstr(rows - 1, 0, "[...] Press INSERT for help information."[:cols - 1], curses.A_BOLD)  # 最后一行写满会出错，留出最后一列
     # 显示key值
     if args.debug:
         stdscr.addstr(0, cols - 10, f"{key}", curses.A_BOLD)
     
-    stdscr.refresh()
+    stdscr.noutrefresh()
     return paths, original_files  # 返回筛选后的文件和原始文件列表
 
 
-def display_data(stdscr, path):
-    # 创建JSON数据缓存
-    json_cache = JSONDataCache(max_size=50)  # 缓存50条数据
+def move_file_selection(stdscr, paths, original_files, old_selected, new_selected, search_str="", key=""):
+    """同一页内移动光标时，只重绘新旧选中行和页面信息"""
+    rows, cols = stdscr.getmaxyx()
+    row_per_page = rows - 4
+    
+    for selected_file in (old_selected, new_selected):
+        row = selected_file % row_per_page + 2
+        path = paths[selected_file]
+        if not search_str and path.isascii():
+            # 没有搜索高亮时文字不变，只需用 chgat 切换反色属性；纯ASCII文件名的长度就是显示宽度
+            attr = curses.A_REVERSE if selected_file == new_selected else curses.A_NORMAL
+            stdscr.chgat(row, 0, min(len(path), cols), attr)
+            continue
+        stdscr.move(row, 0)
+        stdscr.clrtoeol()
+        display_file_row(stdscr, row, path, selected_file == new_selected, search_str, cols)
+    
+    page_info = get_page_info(paths, original_files, new_selected, search_str, row_per_page)
+    stdscr.move(1, 0)
+    stdscr.clrtoeol()
+    stdscr.addstr(1, 0, page_info[:cols], curses.A_BOLD)
+    # 显示key值
+    if args.debug:
+        stdscr.move(0, cols - 10)
+        stdscr.clrtoeol()
+        stdscr.addstr(0, cols - 10, f"{key}", curses.A_BOLD)
+    
+    stdscr.noutrefresh()
+
+
+def prefetch_json_data(executor, json_lines, selected_data, cols, json_cache, show_values):
+    """在后台线程中格式化相邻数据并写入缓存，切换数据时可直接命中"""
+    futures = []
+    for offset in PREFETCH_OFFSETS:
+        index = selected_data + offset
+        if 0 <= index < len(json_lines):
+            futures.append(executor.submit(load_json_data, json_lines, index, cols, json_cache, show_values))
+    return futures
+
+
+def cancel_prefetch(futures):
+    """取消尚未开始的预取任务，并等待正在执行的任务结束，避免其在缓存清空后写入旧数据或读取已关闭的文件"""
+    for future in futures:
+        future.cancel()
+    wait(futures)
+
+
+def display_data(stdscr, path, json_cache=None):
+    # 未传入共享缓存时创建JSON数据缓存
+    json_cache = json_cache or JSONDataCache()
+    prefetcher = ThreadPoolExecutor(max_workers=1)
+    prefetch_futures = []
     
     while True:
+        # 在共享缓存中只访问当前文件的数据；读取前记录文件状态，文件修改后不会命中旧数据
+        data_cache = FileDataCache(json_cache, get_file_source(path))
         if path.endswith('.jsonl'):
             json_lines = read_jsonl(path)
         elif path.endswith('.json'):
@@ -523,117 +964,168 @@ def display_data(stdscr, path):
         elif path.endswith('.txt'):
             json_lines = read_txt(path)
         else:
+            prefetcher.shutdown()
             return -1
         
         selected_data = 0   # 当前数据编号
         start_line = 0      # 当前数据开始行号
-        key_lines = []      # 当前数据所有键的开始行号
         search_str = ''     # 用于记录搜索字符串
         jump_line_str = ''  # 用于记录输入行号
         key = ''
         tool_selector = ToolSelector()
         show_values = True  # 是否显示完整键值
+        loaded = None  # 已加载内容对应的 (数据编号, 宽度, 是否显示值)，不变时滚动等按键无需重新加载
+        pad = None  # 绘制好的内容窗口，滚动时只需移动显示区域
+        pad_state = None  # 绘制 pad 时的 (数据编号, 宽度, 是否显示值, 搜索词)
+        pad_start = 0  # pad 第一行对应的内容行号
+        pad_end = 0  # pad 最后一行之后对应的内容行号
+        drawn = None  # 上次绘制时的界面状态
+        prefetched = None  # 已提交预取任务时的 (数据编号, 宽度, 是否显示值)
 
         while True:
             rows, cols = stdscr.getmaxyx()
-            stdscr.clear()
+            # 界面状态没有变化（如按下无效按键）时跳过整屏重绘
+            frame = (rows, cols, selected_data, start_line, show_values, search_str, jump_line_str, tool_selector.tool, key if args.debug else None)
+            if frame != drawn:
+                stdscr.erase()
 
-            # 显示 json 内容
-            try:
-                full_lines_with_lineno, skeleton_lines_with_lineno = load_json_data(json_lines, selected_data, cols, json_cache)
-                lines_with_lineno = full_lines_with_lineno if show_values else skeleton_lines_with_lineno
-            except:
-                lines_with_lineno = []
-                for i, line in enumerate(traceback.format_exc().split('\n')):
-                    lines_with_lineno.extend([(l, i) for l in split_str(line, cols)])
-            finally:
-                lines = [l for l, _ in lines_with_lineno]
-                key_lines = get_key_lines(lines)
-                add_colored_json(stdscr, 2, 0, lines_with_lineno[start_line:start_line+rows-5], search=search_str)
-
-            # 显示文件名
-            stdscr.addstr(0, 0, f"JSONL file: {path[:cols-12]}", curses.A_BOLD)
-            # 显示数据编号
-            stdscr.addstr(1, 0, f"Current line: {selected_data + 1} / {len(json_lines)}", curses.A_BOLD)
-            # 显示key值
-            if args.debug:
-                stdscr.addstr(0, cols - 10, f"{key}", curses.A_BOLD)
-            # 显示搜索输入
-            stdscr.addstr(rows - 3, 0, f"[...] Search: {search_str}"[:cols], (curses.A_BOLD | curses.A_REVERSE) if tool_selector.tool == ToolType.SEARCH else curses.A_BOLD)
-            # 显示行号输入
-            stdscr.addstr(rows - 2, 0, f"[...] Jump: {jump_line_str}"[:cols], (curses.A_BOLD | curses.A_REVERSE) if tool_selector.tool == ToolType.JUMP else curses.A_BOLD)
-            # 显示提示
-            stdscr.addstr(rows - 1, 0, f"[...] Press INSERT for help information."[:cols], curses.A_BOLD)
-
-            stdscr.refresh()
+                # 显示 json 内容
+                if loaded != (selected_data, cols, show_values):
+                    try:
+                        lines_with_lineno = load_json_data(json_lines, selected_data, cols, data_cache, show_values)
+                    except:
+                        lines_with_lineno = []
+                        for i, line in enumerate(traceback.format_exc().split('\n')):
+                            lines_with_lineno.extend([(l, i) for l in split_str(line, cols)])
+                    loaded = (selected_data, cols, show_values)
+                # 把当前位置附近的内容着色绘制到 pad 中，在其范围内滚动时无需重新绘制
+                view_rows = rows - 5
+                if (pad is None or pad_state != (selected_data, cols, show_values, search_str) or start_line < pad_start
+                        or (start_line + view_rows > pad_end and pad_end < len(lines_with_lineno))):
+                    # pad 从当前位置之前 PAD_LINES // 4 行开始，至少覆盖整个显示区域以及其后的 PAD_LINES 行，窗口很高时也不会留空
+                    pad_start = max(0, start_line - PAD_LINES // 4)
+                    pad_end = min(start_line + view_rows + PAD_LINES, len(lines_with_lineno))
+                    pad = curses.newpad(max(pad_end - pad_start, start_line - pad_start + view_rows) + 1, cols)
+                    layout = data_cache.get_layout(selected_data, cols, show_values, lines_with_lineno)
+                    add_colored_json(pad, 0, 0, layout, pad_start, pad_end, search=search_str)
+                    pad_state = (selected_data, cols, show_values, search_str)
+
+                # 显示文件名
+                stdscr.addstr(0, 0, f"JSONL file: {path[:cols-12]}", curses.A_BOLD)
+                # 显示数据编号
+                stdscr.addstr(1, 0, f"Current line: {selected_data + 1} / {len(json_lines)}", curses.A_BOLD)
+                # 显示key值
+                if args.debug:
+                    stdscr.addstr(0, cols - 10, f"{key}", curses.A_BOLD)
+                # 显示搜索输入
+                stdscr.addstr(rows - 3, 0, f"[...] Search: {search_str}"[:cols], (curses.A_BOLD | curses.A_REVERSE) if tool_selector.tool == ToolType.SEARCH else curses.A_BOLD)
+                # 显示行号输入
+                stdscr.addstr(rows - 2, 0, f"[...] Jump: {jump_line_str}"[:cols], (curses.A_BOLD | curses.A_REVERSE) if tool_selector.tool == ToolType.JUMP else curses.A_BOLD)
+                # 显示提示
+                stdscr.addstr(rows - 1, 0, f"[...] Press INSERT for help information."[:cols - 1], curses.A_BOLD)  # 最后一行写满会出错，留出最后一列
+
+                stdscr.noutrefresh()
+                if view_rows > 0:
+                    # stdscr 刷新时覆盖了内容区域，需要重新标记 pad 以便完整复制
+                    pad.touchwin()
+                    pad.noutrefresh(start_line - pad_start, 0, 2, 0, rows - 4, cols - 1)
+                curses.doupdate()
+                drawn = frame
+
+            # 等待按键时在后台预取相邻数据，数据跳转后取消旧的预取任务；
+            # 已经开始执行的任务无法取消，继续保留在列表中，清空缓存或关闭文件前仍会等待它结束
+            if prefetched != (selected_data, cols, show_values):
+                prefetch_futures = [future for future in prefetch_futures if not future.cancel() and not future.done()]
+                prefetch_futures += prefetch_json_data(prefetcher, json_lines, selected_data, cols, data_cache, show_values)
+                prefetched = (selected_data, cols, show_values)
 
             key = stdscr.getch()
-            if key == curses.KEY_IC or key == 506:  # INSERT - 显示帮助
+            action = KEY_ACTIONS.get(key)
+            if action is KeyAction.HELP:  # INSERT - 显示帮助
                 display_help_info(stdscr)
-            elif key == (ord('a') & 0x1f) or key == 1:  # Ctrl+A - 刷新数据
-                json_cache.clear()
+                drawn = None  # 帮助界面覆盖了屏幕，需要完整重绘
+            elif action is KeyAction.REFRESH:  # Ctrl+A - 刷新数据
+                cancel_prefetch(prefetch_futures)
+                data_cache.clear()
+                if isinstance(json_lines, JsonlFile):
+                    json_lines.close()
                 break
-            elif key == (ord('z') & 0x1f) or key == 2:  # Ctrl+B - 清除缓存
+            elif action is KeyAction.CLEAR_CACHE:  # Ctrl+B - 清除缓存
+                cancel_prefetch(prefetch_futures)
                 json_cache.clear()
-            elif key == curses.KEY_RIGHT or key == 454:
-                selected_data = min(selected_data + 1, max(len(json_lines) - 1, 0))
+                loaded = None
+                prefetched = None
+                pad = None
+            elif action is KeyAction.RIGHT:
+                selected_data = min(selected_data + count_repeated_key(stdscr, key), max(len(json_lines) - 1, 0))
                 start_line = 0
-            elif key == curses.KEY_LEFT or key == 452:
-                selected_data = max(selected_data - 1, 0)
+            elif action is KeyAction.LEFT:
+                selected_data = max(selected_data - count_repeated_key(stdscr, key), 0)
                 start_line = 0
-            elif key == curses.KEY_DOWN or key == 456:
-                if start_line >= max(len(lines) - (rows - 6), 1):
-                    start_line = len(lines) - (rows - 6) - 1
+            elif action is KeyAction.DOWN:
+                steps = count_repeated_key(stdscr, key)
+                if start_line >= max(len(lines_with_lineno) - (rows - 6), 1):
+                    start_line = max(len(lines_with_lineno) - (rows - 6) - 1, 0)
                 else:
-                    start_line = (start_line + 1) % max(len(lines) - (rows - 6), 1)
-            elif key == curses.KEY_UP or key == 450:
-                if start_line >= max(len(lines) - (rows - 6), 1):
-                    start_line = len(lines) - (rows - 6) - 1
+                    start_line = (start_line + steps) % max(len(lines_with_lineno) - (rows - 6), 1)
+            elif action is KeyAction.UP:
+                steps = count_repeated_key(stdscr, key)
+                if start_line >= max(len(lines_with_lineno) - (rows - 6), 1):
+                    start_line = max(len(lines_with_lineno) - (rows - 6) - 1, 0)
                 else:
-                    start_line = (start_line - 1) % max(len(lines) - (rows - 6), 1)
-            elif key == curses.KEY_NPAGE or key == 457:  # Page Down
-                if start_line >= max(key_lines):
+                    start_line = (start_line - steps) % max(len(lines_with_lineno) - (rows - 6), 1)
+            elif action is KeyAction.PAGE_DOWN:  # Page Down
+                # 只在翻页时查找键所在的行，普通重绘不扫描整条数据
+                key_lines = get_key_lines(l for l, _ in lines_with_lineno)
+                if key_lines and start_line >= max(key_lines):
                     start_line = min(key_lines)
                 else:
                     for kl in key_lines:
                         if kl > start_line:
                             start_line = kl
                             break
-            elif key == curses.KEY_PPAGE or key == 451:  # Page Up
-                if start_line <= min(key_lines):
+            elif action is KeyAction.PAGE_UP:  # Page Up
+                key_lines = get_key_lines(l for l, _ in lines_with_lineno)
+                if key_lines and start_line <= min(key_lines):
                     start_line = max(key_lines)
                 else:
                     for kl in key_lines[::-1]:
                         if kl < start_line:
                             start_line = kl
                             break
-            elif key == 27:  # ESC
-                stdscr.clear()
+            elif action is KeyAction.ESC:  # ESC
+                cancel_prefetch(prefetch_futures)
+                prefetcher.shutdown()
+                if isinstance(json_lines, JsonlFile):
+                    json_lines.close()
+                stdscr.erase()
                 return 0
-            elif key == 9:  # TAB
+            elif action is KeyAction.TAB:  # TAB
                 tool_selector.switch()
-            elif key == curses.KEY_BTAB:
+            elif action is KeyAction.BACK_TAB:
                 show_values = not show_values
                 start_line = 0  # 重置到顶部以便立即看到变化
 
             if tool_selector.tool == ToolType.SEARCH:
                 if 32 <= key <= 126:  # 所有ascii可显示字符
                     search_str += chr(key)  # 添加输入
-                elif key == curses.KEY_BACKSPACE or key == 127:  # 处理删除
+                elif action is KeyAction.BACKSPACE:  # 处理删除
                     search_str = search_str[:-1]  # 删除最后一个字符
-                elif key == ord('\n'):  # 回车
+                elif action is KeyAction.ENTER:  # 回车
                     try:
                         stdscr.addstr(rows - 1, cols - 8, f"LOADING", curses.A_BOLD)
-                        stdscr.refresh()
-                        selected_data, start_line = search_next(json_lines, selected_data, start_line, search_str, show_values, cols)
+                        stdscr.noutrefresh()
+                        curses.doupdate()
+                        selected_data, start_line = search_next(json_lines, selected_data, start_line, search_str, show_values, cols, data_cache, stdscr)
                     except:
                         pass
+                    drawn = None  # 清除 LOADING 提示
             elif tool_selector.tool == ToolType.JUMP:
                 if 48 <= key <= 57:  # 数字键（0-9）
                     jump_line_str += chr(key)  # 添加输入
-                elif key == curses.KEY_BACKSPACE or key == 127:  # 处理删除
+                elif action is KeyAction.BACKSPACE:  # 处理删除
                     jump_line_str = jump_line_str[:-1]  # 删除最后一个字符
-                elif key == ord('\n'):  # 回车
+                elif action is KeyAction.ENTER:  # 回车
                     try:
                         target_line = int(jump_line_str) - 1  # 转换为索引（从0开始）
                         if 0 <= target_line < len(json_lines):
@@ -644,16 +1136,18 @@ def display_data(stdscr, path):
                         pass  # 无效输入时不做任何操作
 
 
-def file_explorer(stdscr):
-    # 初始化颜色
-    curses.start_color()
-    curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)  # 白色
-    curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)    # 红色
-    curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)  # 绿色
-    curses.init_pair(4, curses.COLOR_BLUE, curses.COLOR_BLACK)   # 蓝色
-    curses.init_pair(5, curses.COLOR_YELLOW, curses.COLOR_BLACK) # 黄色
-    curses.init_pair(6, curses.COLOR_BLACK, curses.COLOR_YELLOW) # 警告
+def save_selected_index(path_history, current_path, files, selected_file):
+    """离开目录前保存当前选中文件在原始文件列表中的位置"""
+    if current_path not in path_history or not 0 <= selected_file < len(files):
+        return
+    current_history = path_history[current_path]
+    selected_filename = files[selected_file]
+    if selected_filename in current_history["name_to_index"]:
+        current_history["selected_index"] = current_history["name_to_index"][selected_filename]
+
 
+def file_explorer(stdscr):
+    init_colors()
     curses.curs_set(0)
     stdscr.keypad(True)  # 启用特殊键
 
@@ -662,40 +1156,37 @@ def file_explorer(stdscr):
     selected_file = 0
     search_str = ""  # 搜索字符串
     file_cache = FileCache()  # 创建文件缓存实例
+    json_cache = JSONDataCache()  # 数据缓存在打开的文件之间共享，重新打开文件时无需重新格式化
     
     # 保存每个目录的原始文件列表和选中位置
-    path_history = {}  # {path: {"original_files": [], "selected_index": 0}}
+    path_history = {}  # {path: {"name_to_index": {}, "selected_index": 0}}
     
     files, original_files = display_files(stdscr, current_path, selected_file, search_str, file_cache)
-    path_history[current_path] = {"original_files": original_files, "selected_index": selected_file}
+    path_history[current_path] = {"name_to_index": file_cache.get_name_index(current_path, original_files), "selected_index": selected_file}
+    curses.doupdate()
+    screen_size = stdscr.getmaxyx()  # 上次完整重绘时的窗口大小
 
     while True:
         key = stdscr.getch()
+        action = KEY_ACTIONS.get(key)
         rows, cols = stdscr.getmaxyx()
+        prev_selected = selected_file
+        prev_state = (current_path, search_str)
 
         # 处理搜索输入
-        if key == curses.KEY_IC or key == 506:  # INSERT - 显示帮助
+        if action is KeyAction.HELP:  # INSERT - 显示帮助
             display_help_info(stdscr)
         elif 32 <= key <= 126:  # 所有ascii可显示字符
             search_str += chr(key)  # 添加输入
             selected_file = 0  # 重置选中位置到第一个
-        elif key == curses.KEY_BACKSPACE or key == 127:  # 处理删除
+        elif action is KeyAction.BACKSPACE:  # 处理删除
             if search_str:
                 # 有搜索字符串时，删除搜索字符
                 search_str = search_str[:-1]  # 删除最后一个字符
                 selected_file = 0  # 重置选中位置到第一个
             else:
                 # 没有搜索字符串时，返回上级目录
-                # 保存当前目录的选中位置（使用原始文件列表的索引）
-                if current_path in path_history:
-                    current_history = path_history[current_path]
-                    # 找到当前选中文件在原始文件列表中的位置
-                    if files and 0 <= selected_file < len(files):
-                        selected_filename = files[selected_file]
-                        if selected_filename in current_history["original_files"]:
-                            original_index = current_history["original_files"].index(selected_filename)
-                            current_history["selected_index"] = original_index
-                
+                save_selected_index(path_history, current_path, files, selected_file)
                 current_path = os.path.normpath(os.path.join(current_path, "../"))
                 # 恢复上级目录的选中位置
                 if current_path in path_history:
@@ -703,31 +1194,25 @@ def file_explorer(stdscr):
                 else:
                     selected_file = 0
                 search_str = ""  # 清除搜索
-        elif key == 27:  # ESC
+        elif action is KeyAction.ESC:  # ESC
             log.close()
             exit()  # 退出程序
-        elif key == curses.KEY_RIGHT or key == 454:
-            selected_file = min((selected_file // (rows -4) + 1) % (len(files) // (rows -4) + 1) * (rows -4) + selected_file % (rows -4), len(files) -1)
-        elif key == curses.KEY_LEFT or key == 452:
-            selected_file = min((selected_file // (rows -4) - 1) % (len(files) // (rows -4) + 1) * (rows -4) + selected_file % (rows -4), len(files) -1)
-        elif (key == curses.KEY_UP or key == 450):
-            selected_file = (selected_file - 1) % len(files)
-        elif (key == curses.KEY_DOWN or key == 456):
-            selected_file = (selected_file + 1) % len(files)
-        elif key == ord('\n'):
+        elif action is KeyAction.RIGHT and files:
+            page_count = get_page_count(len(files), rows - 4)
+            selected_file = min((selected_file // (rows -4) + 1) % page_count * (rows -4) + selected_file % (rows -4), len(files) -1)
+        elif action is KeyAction.LEFT and files:
+            page_count = get_page_count(len(files), rows - 4)
+            selected_file = min((selected_file // (rows -4) - 1) % page_count * (rows -4) + selected_file % (rows -4), len(files) -1)
+        elif action is KeyAction.UP and files:
+            selected_file = (selected_file - count_repeated_key(stdscr, key)) % len(files)
+        elif action is KeyAction.DOWN and files:
+            selected_file = (selected_file + count_repeated_key(stdscr, key)) % len(files)
+        elif action is KeyAction.ENTER:
             if files:  # 确保文件列表不为空
                 new_path = os.path.normpath(os.path.join(current_path, files[selected_file]))
-                if os.path.isdir(new_path):
-                    # 保存当前目录的选中位置（使用原始文件列表的索引）
-                    if current_path in path_history:
-                        current_history = path_history[current_path]
-                        # 找到当前选中文件在原始文件列表中的位置
-                        if files and 0 <= selected_file < len(files):
-                            selected_filename = files[selected_file]
-                            if selected_filename in current_history["original_files"]:
-                                original_index = current_history["original_files"].index(selected_filename)
-                                current_history["selected_index"] = original_index
-                    
+                # 列表中的文件夹以 '/' 结尾，直接据此判断，无需再 stat 一次
+                if files[selected_file].endswith('/'):
+                    save_selected_index(path_history, current_path, files, selected_file)
                     current_path = new_path
                     if files[selected_file] == "../":
                         if current_path in path_history:
@@ -737,24 +1222,36 @@ def file_explorer(stdscr):
                     else:
                         selected_file = 0
                     search_str = ""  # 进入新目录时清除搜索
-                elif os.path.isfile(new_path):
+                else:
                     if new_path.endswith('.jsonl') or new_path.endswith('.json') or new_path.endswith('.txt'):
-                        display_data(stdscr, new_path)
-                        # 重新获取当前目录的文件列表
-                        files, original_files = display_files(stdscr, current_path, selected_file, search_str, file_cache, key=key)
-                        if current_path not in path_history:
-                            path_history[current_path] = {"original_files": original_files, "selected_index": selected_file}
-
-        # 更新显示
-        files, original_files = display_files(stdscr, current_path, selected_file, search_str, file_cache, key=key)
+                        display_data(stdscr, new_path, json_cache)
+
+        # 只有布局变化时才清屏完整重绘：目录或搜索词变化、窗口大小变化、翻页，
+        # 以及帮助、数据模式等覆盖了整个屏幕的操作；同一页内上下移动只重绘变化的行
+        needs_full_redraw = (
+            (current_path, search_str) != prev_state
+            or (rows, cols) != screen_size
+            or prev_selected // (rows - 4) != selected_file // (rows - 4)
+            or action not in (KeyAction.UP, KeyAction.DOWN)
+            or not files
+        )
+        if needs_full_redraw:
+            # 完整重绘前重新获取文件列表：目录修改时间不变时只需一次 stat 并返回缓存的列表，
+            # 目录中新建或删除的文件也能及时显示；同一页内上下移动直接复用已有列表
+            original_files = file_cache.get_files(current_path)
+            files, original_files = display_files(stdscr, current_path, selected_file, search_str, file_cache, original_files=original_files, key=key)
+            screen_size = (rows, cols)
+        else:
+            move_file_selection(stdscr, files, original_files, prev_selected, selected_file, search_str, key=key)
         
         # 更新路径历史
+        name_to_index = file_cache.get_name_index(current_path, original_files)
         if current_path not in path_history:
-            path_history[current_path] = {"original_files": original_files, "selected_index": selected_file}
+            path_history[current_path] = {"name_to_index": name_to_index, "selected_index": selected_file}
         else:
-            path_history[current_path]["original_files"] = original_files
+            path_history[current_path]["name_to_index"] = name_to_index
         
-        stdscr.refresh()
+        curses.doupdate()
 
 
 if __name__ == "__main__":